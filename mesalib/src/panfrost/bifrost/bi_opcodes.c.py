@@ -30,12 +30,12 @@ struct bi_op_props bi_opcode_props[BI_NUM_OPCODES] = {
     <%
         add = instructions["+" + opcode][0][1] if "+" + opcode in instructions else None
         size = typesize(opcode)
-        message = add["message"].upper() if add else "NONE"
-        sr_count = add["staging_count"].upper() if add else "0"
-        sr_read = int(add["staging"] in ["r", "rw"] if add else False)
-        sr_write = int(add["staging"] in ["w", "rw"] if add else False)
-        last = int(bool(add["last"]) if add else False)
-        table = int(bool(add["table"]) if add else False)
+        message = add.message.upper() if add else "NONE"
+        sr_count = add.staging_count.upper() if add else "0"
+        sr_read = int(add.staging in ["r", "rw"] if add else False)
+        sr_write = int(add.staging in ["w", "rw"] if add else False)
+        last = int(bool(add.last) if add else False)
+        table = int(bool(add.table) if add else False)
         branch = int(opcode.startswith('BRANCH'))
         has_fma = int("*" + opcode in instructions)
         has_add = int("+" + opcode in instructions)
@@ -206,7 +206,7 @@ ${"\\n".join(["        " + x for x in s_body + ["return {};".format(" | ".join(p
 
 def pack_variant(opname, states):
     # Expressions to be ORed together for the final pack, an array per state
-    pack_exprs = [[hex(state[1]["exact"][1])] for state in states]
+    pack_exprs = [[hex(state[1].exact[1])] for state in states]
 
     # Computations which need to be done to encode first, across states
     common_body = []
@@ -219,16 +219,16 @@ def pack_variant(opname, states):
     # Pack sources. Offset over to deal with staging/immediate weirdness in our
     # IR (TODO: reorder sources upstream so this goes away). Note sources are
     # constant across states.
-    staging = states[0][1].get("staging", "")
+    staging = states[0][1].staging
     offset = 0
     if staging in ["r", "rw"]:
         offset += 1
 
-    pack_sources(states[0][1].get("srcs", []), common_body, pack_exprs, offset, opname[0] == '*')
+    pack_sources(states[0][1].srcs, common_body, pack_exprs, offset, opname[0] == '*')
 
     modifiers_handled = []
     for st in states:
-        for ((mod, _, width), default, opts) in st[1].get("modifiers", []):
+        for ((mod, _, width), default, opts) in st[1].modifiers:
             if mod in modifiers_handled:
                 continue
 
@@ -238,11 +238,11 @@ def pack_variant(opname, states):
             imm_map[mod] = { x: y for y, x in enumerate(opts) }
 
     for i, st in enumerate(states):
-        for ((mod, pos, width), default, opts) in st[1].get("modifiers", []):
+        for ((mod, pos, width), default, opts) in st[1].modifiers:
             if pos is not None:
                 pack_exprs[i].append('({} << {})'.format(mod, pos))
 
-    for ((src_a, src_b), cond, remap) in st[1].get("swaps", []):
+    for ((src_a, src_b), cond, remap) in st[1].swaps:
         # Figure out which vars to swap, in order to swap the arguments. This
         # always includes the sources themselves, and may include source
         # modifiers (with the same source indices). We swap based on which
@@ -250,7 +250,7 @@ def pack_variant(opname, states):
         # up swapping at all since it would swap back.
 
         vars_to_swap = ['src']
-        for ((mod, _, width), default, opts) in st[1].get("modifiers", []):
+        for ((mod, _, width), default, opts) in st[1].modifiers:
             if mod[-1] in str(src_a):
                 vars_to_swap.append(mod[0:-1])
 
@@ -273,7 +273,7 @@ def pack_variant(opname, states):
         common_body.append('}')
         common_body.append('')
 
-    for (name, pos, width) in st[1].get("immediates", []):
+    for (name, pos, width) in st[1].immediates:
         common_body.append('unsigned {} = I->{};'.format(name, name))
         common_body.append('assert({} < {});'.format(name, hex(1 << width)))
 
@@ -284,7 +284,7 @@ def pack_variant(opname, states):
     state_body = [[] for s in states]
 
     for i, (_, st) in enumerate(states):
-        for ((pos, width), exprs) in st.get("derived", []):
+        for ((pos, width), exprs) in st.derived:
             pack_derived(pos, exprs, imm_map, state_body[i], pack_exprs[i])
 
     # How do we pick a state? Accumulate the conditions
@@ -50,10 +50,37 @@ COPYRIGHT = """/*
 
 # Parse instruction set XML into a normalized form for processing
 
-import xml.etree.ElementTree as ET
-import copy
+try:
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
 import itertools
-from collections import OrderedDict
+import sys
+
+# The same leaf conditions and integers recur throughout the ISA, so memoize
+# their parsed forms keyed on the attribute strings. Parsed results are never
+# modified afterwards, so they may be shared between instructions.
+
+_cond_cache = {}
+_int_cache = {}
+
+# Parse an integer attribute, autodetecting the base. The same handful of
+# strings recur thousands of times, so look them up rather than reparsing.
+
+def parse_int(s):
+    value = _int_cache.get(s)
+
+    if value is None:
+        value = int(s, 0)
+        _int_cache[s] = value
+
+    return value
+
+# Parse a boolean flag attribute, which is false if absent
+
+def parse_bool(obj, name):
+    return obj.attrib.get(name, 'false') not in ('false', '0', '')
 
 def parse_cond(cond, aliased = False):
     if cond.tag == 'reserved':
@@ -63,101 +90,176 @@ def parse_cond(cond, aliased = False):
         return ['alias', parse_cond(cond, True)]
 
     if 'left' in cond.attrib:
-        return [cond.tag, cond.attrib['left'], cond.attrib['right']]
+        key = (cond.tag, cond.attrib['left'], cond.attrib['right'])
+        parsed = _cond_cache.get(key)
+
+        if parsed is None:
+            parsed = [sys.intern(x) for x in key]
+            _cond_cache[key] = parsed
+
+        return parsed
     else:
-        return [cond.tag] + [parse_cond(x) for x in cond.findall('*')]
+        return [sys.intern(cond.tag)] + [parse_cond(x) for x in cond.findall('*')]
 
 def parse_exact(obj):
-    return [int(obj.attrib['mask'], 0), int(obj.attrib['exact'], 0)]
+    return [parse_int(obj.attrib['mask']), parse_int(obj.attrib['exact'])]
 
-def parse_derived(obj):
+def parse_derived(derived):
     out = []
 
-    for deriv in obj.findall('derived'):
-        loc = [int(deriv.attrib['start']), int(deriv.attrib['size'])]
+    for deriv in derived:
+        loc = [parse_int(deriv.attrib['start']), parse_int(deriv.attrib['size'])]
         count = 1 << loc[1]
 
         opts = [parse_cond(d) for d in deriv.findall('*')]
-        default = [None] * count
-        opts_fit = (opts + default)[0:count]
 
-        out.append([loc, opts_fit])
+        # Pad out with None (reserved)
+        if len(opts) < count:
+            opts.extend([None] * (count - len(opts)))
+        else:
+            del opts[count:]
+
+        out.append([loc, opts])
 
     return out
 
-def parse_modifiers(obj, include_pseudo):
+def parse_modifiers(mods, include_pseudo):
     out = []
 
-    for mod in obj.findall('mod'):
-        if mod.attrib.get('pseudo', False) and not include_pseudo:
+    for mod in mods:
+        if parse_bool(mod, 'pseudo') and not include_pseudo:
             continue
 
         name = mod.attrib['name']
         start = mod.attrib.get('start', None)
-        size = int(mod.attrib['size'])
+        size = parse_int(mod.attrib['size'])
 
         if start is not None:
-            start = int(start)
+            start = parse_int(start)
 
-        opts = [x.text if x.tag == 'opt' else x.tag for x in mod.findall('*')]
+        # Option names repeat across the whole ISA, so intern them
+        opts = [sys.intern(x.text if x.tag == 'opt' else x.tag) for x in mod.findall('*')]
 
         if len(opts) == 0:
             assert('opt' in mod.attrib)
-            opts = ['none', mod.attrib['opt']]
+            opts = ['none', sys.intern(mod.attrib['opt'])]
 
         # Find suitable default
         default = mod.attrib.get('default', 'none' if 'none' in opts else None)
 
         # Pad out as reserved
         count = (1 << size)
-        opts = (opts + (['reserved'] * count))[0:count]
+
+        if len(opts) < count:
+            opts.extend(['reserved'] * (count - len(opts)))
+        else:
+            del opts[count:]
+
         out.append([[name, start, size], default, opts])
 
     return out
 
-def parse_copy(enc, existing):
-    for node in enc.findall('copy'):
+def parse_copy(copies, existing):
+    for node in copies:
         name = node.get('name')
         for ex in existing:
             if ex[0][0] == name:
                 ex[0][1] = node.get('start')
 
+# A single encoding of an instruction. There are thousands of these with the
+# same fixed set of fields, so use slots rather than a dict per variant.
+
+class InstructionVariant:
+    __slots__ = ['srcs', 'modifiers', 'immediates', 'swaps', 'derived',
+                 'staging', 'staging_count', 'dests', 'unused', 'pseudo',
+                 'message', 'last', 'table', 'exact']
+
+    def __init__(self, srcs, modifiers, immediates, swaps, derived, staging,
+                 staging_count, dests, unused, pseudo, message, last, table,
+                 exact = None):
+        self.srcs = srcs
+        self.modifiers = modifiers
+        self.immediates = immediates
+        self.swaps = swaps
+        self.derived = derived
+        self.staging = staging
+        self.staging_count = staging_count
+        self.dests = dests
+        self.unused = unused
+        self.pseudo = pseudo
+        self.message = message
+        self.last = last
+        self.table = table
+        self.exact = exact
+
+# Copy the common part of an instruction for a particular encoding. Only the
+# modifier locations are modified per-encoding (by parse_copy), so everything
+# else is shared with the common description rather than deep copied.
+
+def clone_common(common):
+    return InstructionVariant(
+            srcs = common.srcs,
+            modifiers = [[list(m[0]), m[1], m[2]] for m in common.modifiers],
+            immediates = common.immediates,
+            swaps = common.swaps,
+            derived = [],
+            staging = common.staging,
+            staging_count = common.staging_count,
+            dests = common.dests,
+            unused = common.unused,
+            pseudo = common.pseudo,
+            message = common.message,
+            last = common.last,
+            table = common.table)
+
+# Group the children of a node by tag in a single pass, preserving document
+# order within each tag
+
+def group_children(node):
+    by_tag = {}
+
+    for child in node:
+        by_tag.setdefault(child.tag, []).append(child)
+
+    return by_tag
+
 def parse_instruction(ins, include_pseudo):
-    common = {
-            'srcs': [],
-            'modifiers': [],
-            'immediates': [],
-            'swaps': [],
-            'derived': [],
-            'staging': ins.attrib.get('staging', '').split('=')[0],
-            'staging_count': ins.attrib.get('staging', '=0').split('=')[1],
-            'dests': int(ins.attrib.get('dests', '1')),
-            'unused': ins.attrib.get('unused', False),
-            'pseudo': ins.attrib.get('pseudo', False),
-            'message': ins.attrib.get('message', 'none'),
-            'last': ins.attrib.get('last', False),
-            'table': ins.attrib.get('table', False),
-    }
+    common = InstructionVariant(
+            srcs = [],
+            modifiers = [],
+            immediates = [],
+            swaps = [],
+            derived = [],
+            staging = ins.attrib.get('staging', '').split('=')[0],
+            staging_count = ins.attrib.get('staging', '=0').split('=')[1],
+            dests = parse_int(ins.attrib.get('dests', '1')),
+            unused = parse_bool(ins, 'unused'),
+            pseudo = parse_bool(ins, 'pseudo'),
+            message = ins.attrib.get('message', 'none'),
+            last = parse_bool(ins, 'last'),
+            table = parse_bool(ins, 'table'))
 
     if 'exact' in ins.attrib:
-        common['exact'] = parse_exact(ins)
+        common.exact = parse_exact(ins)
 
-    for src in ins.findall('src'):
-        mask = int(src.attrib['mask'], 0) if ('mask' in src.attrib) else 0xFF
-        common['srcs'].append([int(src.attrib['start'], 0), mask])
+    by_tag = group_children(ins)
 
-    for imm in ins.findall('immediate'):
-        if imm.attrib.get('pseudo', False) and not include_pseudo:
+    for src in by_tag.get('src', ()):
+        mask = parse_int(src.attrib['mask']) if ('mask' in src.attrib) else 0xFF
+        common.srcs.append([parse_int(src.attrib['start']), mask])
+
+    for imm in by_tag.get('immediate', ()):
+        if parse_bool(imm, 'pseudo') and not include_pseudo:
             continue
 
-        start = int(imm.attrib['start']) if 'start' in imm.attrib else None
-        common['immediates'].append([imm.attrib['name'], start, int(imm.attrib['size'])])
+        start = parse_int(imm.attrib['start']) if 'start' in imm.attrib else None
+        common.immediates.append([imm.attrib['name'], start, parse_int(imm.attrib['size'])])
 
-    common['derived'] = parse_derived(ins)
-    common['modifiers'] = parse_modifiers(ins, include_pseudo)
+    common.derived = parse_derived(by_tag.get('derived', ()))
+    common.modifiers = parse_modifiers(by_tag.get('mod', ()), include_pseudo)
 
-    for swap in ins.findall('swap'):
-        lr = [int(swap.get('left')), int(swap.get('right'))]
+    for swap in by_tag.get('swap', ()):
+        lr = [parse_int(swap.get('left')), parse_int(swap.get('right'))]
         cond = parse_cond(swap.findall('*')[0])
         rewrites = {}
 
@@ -169,21 +271,23 @@ def parse_instruction(ins, include_pseudo):
 
             rewrites[rw.attrib['name']] = mp
 
-        common['swaps'].append([lr, cond, rewrites])
+        common.swaps.append([lr, cond, rewrites])
 
-    encodings = ins.findall('encoding')
+    encodings = by_tag.get('encoding', [])
     variants = []
 
     if len(encodings) == 0:
         variants = [[None, common]]
     else:
         for enc in encodings:
-            variant = copy.deepcopy(common)
-            assert(len(variant['derived']) == 0)
+            assert(len(common.derived) == 0)
+            variant = clone_common(common)
+
+            enc_by_tag = group_children(enc)
 
-            variant['exact'] = parse_exact(enc)
-            variant['derived'] = parse_derived(enc)
-            parse_copy(enc, variant['modifiers'])
+            variant.exact = parse_exact(enc)
+            variant.derived = parse_derived(enc_by_tag.get('derived', ()))
+            parse_copy(enc_by_tag.get('copy', ()), variant.modifiers)
 
             cond = parse_cond(enc.findall('*')[0])
             variants.append([cond, variant])
@@ -199,11 +303,11 @@ def parse_instructions(xml, include_unused = False, include_pseudo = False):
 
         # Some instructions are for useful disassembly only and can be stripped
         # out of the compiler, particularly useful for release builds
-        if parsed[0][1]["unused"] and not include_unused:
+        if parsed[0][1].unused and not include_unused:
             continue
 
         # On the other hand, some instructions are only for the IR, not disassembly
-        if parsed[0][1]["pseudo"] and not include_pseudo:
+        if parsed[0][1].pseudo and not include_pseudo:
             continue
 
         final[ins.attrib['name']] = parsed
@@ -212,8 +316,10 @@ def parse_instructions(xml, include_unused = False, include_pseudo = False):
 
 # Expand out an opcode name to something C-escaped
 
+_OPNAME_TABLE = str.maketrans('.', '_')
+
 def opname_to_c(name):
-    return name.lower().replace('*', 'fma_').replace('+', 'add_').replace('.', '_')
+    return name.lower().replace('*', 'fma_').replace('+', 'add_').translate(_OPNAME_TABLE)
 
 # Expand out distinct states to distrinct instructions, with a placeholder
 # condition for instructions with a single state
@@ -237,18 +343,17 @@ def expand_states(instructions):
 
 def simplify_to_ir(ins):
     return {
-            'staging': ins['staging'],
-            'srcs': len(ins['srcs']),
-            'dests': ins['dests'],
-            'modifiers': [[m[0][0], m[2]] for m in ins['modifiers']],
-            'immediates': [m[0] for m in ins['immediates']]
+            'staging': ins.staging,
+            'srcs': len(ins.srcs),
+            'dests': ins.dests,
+            'modifiers': [[m[0][0], m[2]] for m in ins.modifiers],
+            'immediates': [m[0] for m in ins.immediates]
         }
 
 
-def combine_ir_variants(instructions, key):
-    seen = [op for op in instructions.keys() if op[1:] == key]
-    variant_objs = [[simplify_to_ir(Q[1]) for Q in instructions[x]] for x in seen]
-    variants = sum(variant_objs, [])
+def combine_ir_variants(instructions, members):
+    variant_objs = [[simplify_to_ir(Q[1]) for Q in instructions[x]] for x in members]
+    variants = list(itertools.chain.from_iterable(variant_objs))
 
     # Accumulate modifiers across variants
     modifiers = {}
@@ -262,9 +367,9 @@ def combine_ir_variants(instructions, key):
 
         for name, opts in s['modifiers']:
             if name not in modifiers:
-                modifiers[name] = copy.deepcopy(opts)
+                modifiers[name] = list(opts)
             else:
-                modifiers[name] += opts
+                modifiers[name].extend(opts)
 
     # Great, we've checked srcs/immediates are consistent and we've summed over
     # modifiers
@@ -285,7 +390,7 @@ def partition_mnemonics(instructions):
     key_func = lambda x: x[1:]
     sorted_instrs = sorted(instructions.keys(), key = key_func)
     partitions = itertools.groupby(sorted_instrs, key_func)
-    return { k: combine_ir_variants(instructions, k) for k, v in partitions }
+    return { k: combine_ir_variants(instructions, list(v)) for k, v in partitions }
 
 # Generate modifier lists, by accumulating all the possible modifiers, and
 # deduplicating thus assigning canonical enum values. We don't try _too_ hard
@@ -309,12 +414,12 @@ def order_modifiers(ir_instructions):
             name_ = name[0:-1] if name[-1] in "0123" else name
 
             if name_ not in modifier_lists:
-                modifier_lists[name_] = copy.deepcopy(modifiers[name])
+                modifier_lists[name_] = list(modifiers[name])
             else:
-                modifier_lists[name_] += modifiers[name]
+                modifier_lists[name_].extend(modifiers[name])
 
     for mod in modifier_lists:
-        lst = list(OrderedDict.fromkeys(modifier_lists[mod]))
+        lst = list(dict.fromkeys(modifier_lists[mod]))
 
         # Ensure none is false for booleans so the builder makes sense
         if len(lst) == 2 and lst[1] == "none":
@@ -329,11 +434,12 @@ def order_modifiers(ir_instructions):
 
     return out
 
+_STAGING_ADDS_SRC = frozenset(["r", "rw"])
+
 # Count sources for a simplified (IR) instruction, including a source for a
 # staging register if necessary
 def src_count(op):
-    staging = 1 if (op["staging"] in ["r", "rw"]) else 0
-    return op["srcs"] + staging
+    return op["srcs"] + (op["staging"] in _STAGING_ADDS_SRC)
 
 # Parses out the size part of an opocde name
 def typesize(opcode):
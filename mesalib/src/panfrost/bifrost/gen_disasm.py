@@ -36,7 +36,7 @@ def reserved_mask(derived):
     return (pos, width, mask)
 
 def reserved_masks(op):
-    masks = [reserved_mask(m) for m in op[2].get("derived", [])]
+    masks = [reserved_mask(m) for m in op[2].derived]
     return [m for m in masks if m[2] != 0]
 
 # To decode instructions, pattern match based on the rules:
@@ -57,10 +57,10 @@ def decode_op(instructions, is_fma):
 
     # Sort by exact masks, descending
     MAX_MASK = (1 << (23 if is_fma else 20)) - 1
-    options.sort(key = lambda n: (MAX_MASK ^ instructions[n][2]["exact"][0]))
+    options.sort(key = lambda n: (MAX_MASK ^ instructions[n][2].exact[0]))
 
     # Map to what we need to template
-    mapped = [(opname_to_c(op), instructions[op][2]["exact"], reserved_masks(instructions[op])) for op in options]
+    mapped = [(opname_to_c(op), instructions[op][2].exact, reserved_masks(instructions[op])) for op in options]
 
     # Generate checks in order
     template = """void
@@ -133,7 +133,7 @@ def find_context_keys(desc, test):
     if len(test) > 0:
         keys |= find_context_keys_expr(test)
 
-    for i, (_, vals) in enumerate(desc.get('derived', [])):
+    for i, (_, vals) in enumerate(desc.derived):
         for j, val in enumerate(vals):
             if val is not None:
                 keys |= find_context_keys_expr(val)
@@ -229,10 +229,10 @@ def build_lut(mnemonic, desc, test):
 
     mod_map = {}
 
-    for ((name, pos, width), default, values) in desc.get('modifiers', []):
+    for ((name, pos, width), default, values) in desc.modifiers:
         mod_map[name] = (width, values, pos, default)
 
-    derived = desc.get('derived', [])
+    derived = desc.derived
 
     # Find the keys and impose an order
     key_set = find_context_keys(desc, test)
@@ -254,7 +254,7 @@ def build_lut(mnemonic, desc, test):
     output = ""
 
     if ordered:
-        output += "bool ordering = (_BITS(bits, {}, 3) > _BITS(bits, {}, 3));\n".format(desc["srcs"][0][0], desc["srcs"][1][0])
+        output += "bool ordering = (_BITS(bits, {}, 3) > _BITS(bits, {}, 3));\n".format(desc.srcs[0][0], desc.srcs[1][0])
 
     for j, key in enumerate(keys):
         # Only generate tables for indirect specifiers
@@ -303,16 +303,16 @@ def disasm_op(name, op):
 
     body += build_lut(mnemonic, desc, test)
 
-    for ((mod, pos, width), default, opts) in desc.get('modifiers', []):
+    for ((mod, pos, width), default, opts) in desc.modifiers:
         if pos is not None:
             body += lut_template.render(field = mod, table = pretty_mods(opts, default), pos = pos, width = width) + "\n"
 
     # Mnemonic, followed by modifiers
     body += '    fputs("{}", fp);\n'.format(mnemonic)
 
-    srcs = desc.get('srcs', [])
+    srcs = desc.srcs
 
-    for mod in desc.get('modifiers', []):
+    for mod in desc.modifiers:
         # Skip per-source until next block
         if mod[0][0][-1] in "0123" and int(mod[0][0][-1]) < len(srcs):
             continue
@@ -333,16 +333,16 @@ def disasm_op(name, op):
             body += '    if (!({} & (1 << _BITS(bits, {}, 3)))) fputs("(INVALID)", fp);\n'.format(hex(mask), pos, 3)
 
         # Print modifiers suffixed with this src number (e.g. abs0 for src0)
-        for mod in desc.get('modifiers', []):
+        for mod in desc.modifiers:
             if mod[0][0][-1] == str(i):
                 body += disasm_mod(mod, skip_mods)
 
     # And each immediate
-    for (imm, pos, width) in desc.get('immediates', []):
+    for (imm, pos, width) in desc.immediates:
         body += '    fprintf(fp, ", {}:%u", _BITS(bits, {}, {}));\n'.format(imm, pos, width)
 
     # Attach a staging register if one is used
-    if desc.get('staging'):
+    if desc.staging:
         body += '    fprintf(fp, ", @r%u", staging_register);\n'
 
     return disasm_op_template.render(c_name = opname_to_c(name), body = body)